@@ -1,15 +1,53 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+import threading
+
+import click
+from flask.cli import with_appcontext
+from flask import (Blueprint, abort, Flask, current_app, render_template, request, redirect, url_for, flash,
+                   session, jsonify)
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime, timedelta, timezone
 from sqlalchemy import func, and_
+from sqlalchemy.orm.attributes import flag_modified
+
+import ratelimit
+from ratelimit import rate_limited
+
+DEFAULT_CONFIG = {
+    'SECRET_KEY': 'dev-secret-key',
+
+    # Database configuration
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///todos.db',
+    'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+
+    # Only enable behind a proxy that authenticates users and sets OWNER_HEADER
+    'TRUST_OWNER_HEADER': False,
+    'OWNER_HEADER': 'X-Owner-Id',
+
+    # Batch concurrent task/comment inserts into one transaction per window.
+    # Only useful with threaded workers (see gunicorn.conf.py); with one
+    # request per process there is nothing to batch.
+    'GROUP_COMMIT_ENABLED': False,
+    'GROUP_COMMIT_WINDOW_MS': 5,
+    'GROUP_COMMIT_TIMEOUT_SECONDS': 30,
 
-app = Flask(__name__)
-app.secret_key = "dev-secret-key"
+    # Token-bucket limits for mutation endpoints, per client and route.
+    # RATE_LIMIT_STORE may be set to a shared ratelimit.BucketStore.
+    'RATE_LIMIT_ENABLED': False,
+    'RATE_LIMIT_PER_SECOND': 10,
+    'RATE_LIMIT_BURST': 20,
+    'RATE_LIMIT_STORE': None,
 
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///todos.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db = SQLAlchemy(app)
+    # Due-date reminders, run with `flask reminders` (see reminders.py)
+    'REMINDER_INTERVAL_SECONDS': 60,
+    'REMINDER_LEAD_MINUTES': 0,
+    'REMINDER_WEBHOOK_URL': None,
+}
+
+db = SQLAlchemy()
+bp = Blueprint('todos', __name__)
+
+# Tenant used for requests that don't identify an owner (single-user installs)
+DEFAULT_OWNER_ID = 0
 
 
 def now_utc():
@@ -17,11 +55,83 @@ def now_utc():
     return datetime.now(timezone.utc)
 
 
+def current_owner_id():
+    """Resolve the owner (tenant) for the current request.
+
+    The app has no login of its own. With TRUST_OWNER_HEADER set, the owner
+    is read from OWNER_HEADER, which must be set by an authenticating proxy
+    that strips any client-supplied value. Otherwise every request belongs
+    to DEFAULT_OWNER_ID.
+    """
+    config = current_app.config
+    if not config['TRUST_OWNER_HEADER']:
+        return DEFAULT_OWNER_ID
+
+    header = request.headers.get(config['OWNER_HEADER'], '').strip()
+    if not header:
+        return DEFAULT_OWNER_ID
+    try:
+        return int(header)
+    except ValueError:
+        abort(400, description=f"Invalid {config['OWNER_HEADER']} header")
+
+
+_group_commit_lock = threading.Lock()
+
+
+def insert_and_commit(obj):
+    """Insert a new row and return its to_dict().
+
+    With GROUP_COMMIT_ENABLED the insert is handed to the group committer
+    and shares a transaction with other inserts arriving in the same window.
+    """
+    app = current_app._get_current_object()
+    if not app.config.get('GROUP_COMMIT_ENABLED'):
+        db.session.add(obj)
+        db.session.commit()
+        return obj.to_dict()
+
+    with _group_commit_lock:
+        committer = app.extensions.get('group_commit')
+        if committer is None:
+            from group_commit import GroupCommitter
+
+            committer = GroupCommitter(app, db, window=app.config['GROUP_COMMIT_WINDOW_MS'] / 1000,
+                                       timeout=app.config['GROUP_COMMIT_TIMEOUT_SECONDS'])
+            app.extensions['group_commit'] = committer
+    # Return this request's pooled connection before blocking, otherwise a burst
+    # of waiting requests can exhaust the pool the committer needs.
+    db.session.close()
+    return committer.submit(obj)
+
+
+def owned_tasks():
+    """Task query scoped to the current owner."""
+    return Task.query.filter(Task.owner_id == current_owner_id())
+
+
+def get_owned_task(task_id):
+    """Fetch a task by id, or None if it doesn't exist or belongs to another owner."""
+    return owned_tasks().filter(Task.id == task_id).first()
+
+
 # Models
 class Task(db.Model):
     __tablename__ = 'tasks'
+    # Composite indexes lead with owner_id so per-owner queries only touch
+    # that owner's slice of the table, regardless of total table size.
+    __table_args__ = (
+        db.Index('ix_tasks_owner_created', 'owner_id', 'created_at'),
+        db.Index('ix_tasks_owner_status_due', 'owner_id', 'status', 'due_date'),
+        db.Index('ix_tasks_owner_status_completed', 'owner_id', 'status', 'completed_at'),
+        # Cross-owner scans used by the reminder scheduler: only the
+        # not-yet-reminded slice is read, in due_date order
+        db.Index('ix_tasks_status_overdue_due', 'status', 'overdue_reminded_at', 'due_date'),
+        db.Index('ix_tasks_status_upcoming_due', 'status', 'upcoming_reminded_at', 'due_date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
+    owner_id = db.Column(db.Integer, nullable=False, default=DEFAULT_OWNER_ID)
     title = db.Column(db.String(255), nullable=False)
     status = db.Column(db.String(50), nullable=False, default="Pending", index=True)
     due_date = db.Column(db.DateTime, nullable=True, index=True)
@@ -29,10 +139,14 @@ class Task(db.Model):
     tags = db.Column(db.String(255), nullable=True)  # Comma-separated
     created_at = db.Column(db.DateTime, nullable=False, default=now_utc, index=True)
     completed_at = db.Column(db.DateTime, nullable=True)
+    # Set when a reminder is sent; cleared whenever due_date or status changes
+    upcoming_reminded_at = db.Column(db.DateTime, nullable=True)
+    overdue_reminded_at = db.Column(db.DateTime, nullable=True)
 
     def to_dict(self):
         return {
             'id': self.id,
+            'owner_id': self.owner_id,
             'title': self.title,
             'status': self.status,
             'due_date': self.due_date.isoformat() if self.due_date else None,
@@ -43,10 +157,26 @@ class Task(db.Model):
         }
 
 
+@db.event.listens_for(Task.due_date, 'set')
+@db.event.listens_for(Task.status, 'set')
+def _rearm_reminders(task, value, oldvalue, initiator):
+    """A new due date, or a task going back to Pending, needs fresh reminders."""
+    if value != oldvalue:
+        # Flag the columns so they are always written: the scheduler may have
+        # claimed the row since it was loaded with None.
+        for column in ('upcoming_reminded_at', 'overdue_reminded_at'):
+            setattr(task, column, None)
+            flag_modified(task, column)
+
+
 class Comment(db.Model):
     __tablename__ = 'comments'
+    __table_args__ = (
+        db.Index('ix_comments_owner_task_created', 'owner_id', 'task_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
+    owner_id = db.Column(db.Integer, nullable=False, default=DEFAULT_OWNER_ID)
     task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False, index=True)
     author_id = db.Column(db.Integer, nullable=True)  # Optional for now, can be used for user auth later
     body = db.Column(db.Text, nullable=False)
@@ -59,25 +189,22 @@ class Comment(db.Model):
         return {
             'id': self.id,
             'task_id': self.task_id,
+            'owner_id': self.owner_id,
             'author_id': self.author_id,
             'body': self.body,
             'created_at': self.created_at.isoformat(),
         }
 
 
-# Create database tables
-with app.app_context():
-    db.create_all()
-
-
-@app.route("/", methods=["GET"])
+@bp.route("/", methods=["GET"])
 def index():
     theme = session.get('theme', 'light')
-    tasks = Task.query.order_by(Task.created_at.desc()).all()
+    tasks = owned_tasks().order_by(Task.created_at.desc()).all()
     return render_template("index.html", tasks=tasks, theme=theme)
 
 
-@app.route("/add", methods=["POST"])
+@bp.route("/add", methods=["POST"])
+@rate_limited
 def add_task():
     title = request.form.get("title", "").strip()
     due_date_str = request.form.get("due_date", "").strip()
@@ -86,7 +213,7 @@ def add_task():
 
     if not title:
         flash("Task cannot be empty.", "warning")
-        return redirect(url_for("index"))
+        return redirect(url_for(".index"))
 
     due_date = None
     if due_date_str:
@@ -94,24 +221,25 @@ def add_task():
             due_date = datetime.fromisoformat(due_date_str)
         except ValueError:
             flash("Invalid due date format.", "warning")
-            return redirect(url_for("index"))
+            return redirect(url_for(".index"))
 
     new_task = Task(
+        owner_id=current_owner_id(),
         title=title,
         status="Pending",
         due_date=due_date,
         priority=priority,
         tags=tags if tags else None
     )
-    db.session.add(new_task)
-    db.session.commit()
+    insert_and_commit(new_task)
     flash(f"Added task: {title}", "success")
-    return redirect(url_for("index"))
+    return redirect(url_for(".index"))
 
 
-@app.route("/toggle/<int:task_id>")
+@bp.route("/toggle/<int:task_id>")
+@rate_limited
 def toggle_task(task_id):
-    task = Task.query.get(task_id)
+    task = get_owned_task(task_id)
     if task:
         task.status = "Completed" if task.status == "Pending" else "Pending"
         if task.status == "Completed":
@@ -122,34 +250,36 @@ def toggle_task(task_id):
         flash(f"Toggled task: {task.title}", "info")
     else:
         flash(f"Task #{task_id} not found", "warning")
-    return redirect(url_for("index"))
+    return redirect(url_for(".index"))
 
 
-@app.route("/toggle_theme")
+@bp.route("/toggle_theme")
 def toggle_theme():
     current_theme = session.get('theme', 'light')
     session['theme'] = 'dark' if current_theme == 'light' else 'light'
-    return redirect(url_for("index"))
+    return redirect(url_for(".index"))
 
 
-@app.route("/delete/<int:task_id>")
+@bp.route("/delete/<int:task_id>")
+@rate_limited
 def delete_task(task_id):
-    task = Task.query.get(task_id)
+    task = get_owned_task(task_id)
     if task:
         db.session.delete(task)
         db.session.commit()
         flash(f"Deleted task #{task_id}", "success")
     else:
         flash(f"Task #{task_id} not found", "warning")
-    return redirect(url_for("index"))
+    return redirect(url_for(".index"))
 
 
-@app.route('/edit/<int:task_id>', methods=['GET', 'POST'])
+@bp.route('/edit/<int:task_id>', methods=['GET', 'POST'])
+@rate_limited
 def edit_task(task_id):
-    task = Task.query.get(task_id)
+    task = get_owned_task(task_id)
     if not task:
         flash(f"Task #{task_id} not found", "warning")
-        return redirect(url_for('index'))
+        return redirect(url_for('.index'))
 
     if request.method == 'POST':
         title = request.form.get('title', '').strip()
@@ -159,7 +289,7 @@ def edit_task(task_id):
 
         if not title:
             flash('Task title cannot be empty.', 'warning')
-            return redirect(url_for('edit_task', task_id=task_id))
+            return redirect(url_for('.edit_task', task_id=task_id))
 
         task.title = title
         task.priority = priority
@@ -170,32 +300,47 @@ def edit_task(task_id):
                 task.due_date = datetime.fromisoformat(due_date_str)
             except ValueError:
                 flash("Invalid due date format.", "warning")
-                return redirect(url_for('edit_task', task_id=task_id))
+                return redirect(url_for('.edit_task', task_id=task_id))
         else:
             task.due_date = None
 
         db.session.commit()
         flash(f"Updated task: {title}", 'success')
-        return redirect(url_for('index'))
+        return redirect(url_for('.index'))
 
     # Render the main page but provide edit_task to show the edit form inline
     theme = session.get('theme', 'light')
-    tasks = Task.query.order_by(Task.created_at.desc()).all()
+    tasks = owned_tasks().order_by(Task.created_at.desc()).all()
     return render_template('index.html', tasks=tasks, edit_task=task, theme=theme)
 
 
+# Task API endpoints
+@bp.route('/api/tasks/<int:task_id>', methods=['GET'])
+def get_task(task_id):
+    task = get_owned_task(task_id)
+    if not task:
+        return jsonify({'error': 'Task not found'}), 404
+    return jsonify(task.to_dict())
+
+
 # Comment endpoints
-@app.route('/api/comments/<int:task_id>', methods=['GET'])
+@bp.route('/api/comments/<int:task_id>', methods=['GET'])
 def get_comments(task_id):
-    task = Task.query.get(task_id)
+    task = get_owned_task(task_id)
     if not task:
         return jsonify({'error': 'Task not found'}), 404
 
-    comments = Comment.query.filter_by(task_id=task_id).order_by(Comment.created_at).all()
+    comments = Comment.query.filter(
+        and_(
+            Comment.owner_id == task.owner_id,
+            Comment.task_id == task_id
+        )
+    ).order_by(Comment.created_at).all()
     return jsonify([comment.to_dict() for comment in comments])
 
 
-@app.route('/api/comments', methods=['POST'])
+@bp.route('/api/comments', methods=['POST'])
+@rate_limited
 def create_comment():
     data = request.get_json()
     if not data:
@@ -208,7 +353,7 @@ def create_comment():
         return jsonify({'error': 'Task ID and body are required'}), 400
 
     # Check if task exists
-    task = Task.query.get(task_id)
+    task = get_owned_task(task_id)
     if not task:
         return jsonify({'error': 'Task not found'}), 404
 
@@ -216,22 +361,27 @@ def create_comment():
     if len(body) > 1000:  # Max length
         return jsonify({'error': 'Comment body too long (max 1000 characters)'}), 400
 
-    # Create comment (author_id is optional and null for now)
+    # Comments inherit the task's owner; the author is whoever is making the
+    # request, never a value taken from the body
     comment = Comment(
+        owner_id=task.owner_id,
         task_id=task_id,
-        author_id=data.get('author_id'),  # Optional
+        author_id=current_owner_id(),
         body=body
     )
 
-    db.session.add(comment)
-    db.session.commit()
+    return jsonify(insert_and_commit(comment)), 201
 
-    return jsonify(comment.to_dict()), 201
 
-
-@app.route('/api/comments/<int:comment_id>', methods=['DELETE'])
+@bp.route('/api/comments/<int:comment_id>', methods=['DELETE'])
+@rate_limited
 def delete_comment(comment_id):
-    comment = Comment.query.get(comment_id)
+    comment = Comment.query.filter(
+        and_(
+            Comment.owner_id == current_owner_id(),
+            Comment.id == comment_id
+        )
+    ).first()
     if not comment:
         return jsonify({'error': 'Comment not found'}), 404
 
@@ -242,10 +392,10 @@ def delete_comment(comment_id):
 
 
 # Stats API Endpoints
-@app.route('/api/stats/completed-today', methods=['GET'])
+@bp.route('/api/stats/completed-today', methods=['GET'])
 def stats_completed_today():
     today = now_utc().date()
-    count = Task.query.filter(
+    count = owned_tasks().filter(
         and_(
             Task.status == "Completed",
             func.date(Task.completed_at) == today
@@ -254,11 +404,11 @@ def stats_completed_today():
     return jsonify({'count': count})
 
 
-@app.route('/api/stats/completed-week', methods=['GET'])
+@bp.route('/api/stats/completed-week', methods=['GET'])
 def stats_completed_week():
     today = now_utc()
     week_ago = today - timedelta(days=7)
-    count = Task.query.filter(
+    count = owned_tasks().filter(
         and_(
             Task.status == "Completed",
             Task.completed_at >= week_ago
@@ -267,10 +417,10 @@ def stats_completed_week():
     return jsonify({'count': count})
 
 
-@app.route('/api/stats/overdue', methods=['GET'])
+@bp.route('/api/stats/overdue', methods=['GET'])
 def stats_overdue():
     now = now_utc()
-    count = Task.query.filter(
+    count = owned_tasks().filter(
         and_(
             Task.status == "Pending",
             Task.due_date < now
@@ -279,7 +429,7 @@ def stats_overdue():
     return jsonify({'count': count})
 
 
-@app.route('/api/stats/completion-trend', methods=['GET'])
+@bp.route('/api/stats/completion-trend', methods=['GET'])
 def stats_completion_trend():
     days = request.args.get('days', default=7, type=int)
     if days not in [7, 14, 30]:
@@ -294,6 +444,7 @@ def stats_completion_trend():
         func.count(Task.id).label('count')
     ).filter(
         and_(
+            Task.owner_id == current_owner_id(),
             Task.status == "Completed",
             Task.completed_at >= start_date
         )
@@ -303,20 +454,25 @@ def stats_completion_trend():
     return jsonify({'days': days, 'trend': result})
 
 
-@app.route('/api/stats/by-priority', methods=['GET'])
+@bp.route('/api/stats/by-priority', methods=['GET'])
 def stats_by_priority():
     stats = db.session.query(
         Task.priority,
         func.count(Task.id).label('count')
-    ).filter(Task.status == "Pending").group_by(Task.priority).all()
+    ).filter(
+        and_(
+            Task.owner_id == current_owner_id(),
+            Task.status == "Pending"
+        )
+    ).group_by(Task.priority).all()
 
     result = {priority: count for priority, count in stats}
     return jsonify(result)
 
 
-@app.route('/api/stats/by-tag', methods=['GET'])
+@bp.route('/api/stats/by-tag', methods=['GET'])
 def stats_by_tag():
-    all_tasks = Task.query.filter(Task.status == "Pending").all()
+    all_tasks = owned_tasks().filter(Task.status == "Pending").all()
     tag_counts = {}
 
     for task in all_tasks:
@@ -329,47 +485,53 @@ def stats_by_tag():
     return jsonify(tag_counts)
 
 
-@app.route('/api/stats/summary', methods=['GET'])
+@bp.route('/api/stats/summary', methods=['GET'])
 def stats_summary():
+    return jsonify(summary_stats())
+
+
+def summary_stats():
+    """Dashboard counters for the current owner."""
     today = now_utc().date()
     now = now_utc()
     week_ago = now - timedelta(days=7)
 
-    completed_today = Task.query.filter(
+    completed_today = owned_tasks().filter(
         and_(
             Task.status == "Completed",
             func.date(Task.completed_at) == today
         )
     ).count()
 
-    completed_week = Task.query.filter(
+    completed_week = owned_tasks().filter(
         and_(
             Task.status == "Completed",
             Task.completed_at >= week_ago
         )
     ).count()
 
-    overdue = Task.query.filter(
+    overdue = owned_tasks().filter(
         and_(
             Task.status == "Pending",
             Task.due_date < now
         )
     ).count()
 
-    total_pending = Task.query.filter(Task.status == "Pending").count()
-    total_completed = Task.query.filter(Task.status == "Completed").count()
+    total_pending = owned_tasks().filter(Task.status == "Pending").count()
+    total_completed = owned_tasks().filter(Task.status == "Completed").count()
 
-    return jsonify({
+    return {
         'completed_today': completed_today,
         'completed_week': completed_week,
         'overdue': overdue,
         'total_pending': total_pending,
         'total_completed': total_completed
-    })
+    }
 
 
 # Bulk operations endpoint
-@app.route('/api/bulk-update', methods=['POST'])
+@bp.route('/api/bulk-update', methods=['POST'])
+@rate_limited
 def bulk_update():
     """
     Handle bulk operations on multiple tasks.
@@ -409,7 +571,7 @@ def bulk_update():
 
     try:
         # Get all tasks
-        tasks = Task.query.filter(Task.id.in_(task_ids)).all()
+        tasks = owned_tasks().filter(Task.id.in_(task_ids)).all()
 
         # Validate all requested tasks exist
         found_ids = {task.id for task in tasks}
@@ -482,5 +644,186 @@ def bulk_update():
         return jsonify({'error': f'Error performing bulk operation: {str(e)}'}), 500
 
 
+# Batch read endpoint
+@bp.route('/api/batch', methods=['POST'])
+def batch():
+    """
+    Run several read sub-requests in one round trip.
+
+    Expected JSON payload:
+    {
+        "requests": [
+            {"op": "tasks", "ids": [1, 2, 3]},
+            {"op": "comments", "task_ids": [1, 2]},
+            {"op": "stats"}
+        ]
+    }
+
+    Responses are returned in the same order. Task ids from all sub-requests
+    are fetched with a single IN query, and comments for all requested tasks
+    with one more, grouped by task.
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+
+    sub_requests = data.get('requests')
+    if not sub_requests or not isinstance(sub_requests, list):
+        return jsonify({'error': 'requests must be a non-empty list'}), 400
+
+    if len(sub_requests) > 50:
+        return jsonify({'error': 'Cannot run more than 50 sub-requests at once'}), 400
+
+    valid_ops = {'tasks': 'ids', 'comments': 'task_ids', 'stats': None}
+    task_ids = set()
+    comment_task_ids = set()
+    for sub in sub_requests:
+        op = sub.get('op') if isinstance(sub, dict) else None
+        if not isinstance(op, str) or op not in valid_ops:
+            return jsonify({'error': f'Invalid op. Must be one of: {", ".join(valid_ops)}'}), 400
+
+        key = valid_ops[op]
+        if key is None:
+            continue
+        ids = sub.get(key)
+        # type() rather than isinstance(): JSON true/false arrive as bool, a subclass of int
+        if not isinstance(ids, list) or not all(type(i) is int for i in ids):
+            return jsonify({'error': f'{key} must be a list of integers for {op}'}), 400
+        if len(ids) > 500:
+            return jsonify({'error': f'Cannot list more than 500 {key} in one sub-request'}), 400
+        task_ids.update(ids)
+        if op == 'comments':
+            comment_task_ids.update(ids)
+
+    if len(task_ids) > 500:
+        return jsonify({'error': 'Cannot fetch more than 500 tasks at once'}), 400
+
+    tasks = {}
+    if task_ids:
+        tasks = {task.id: task.to_dict() for task in owned_tasks().filter(Task.id.in_(task_ids))}
+
+    comments = {task_id: [] for task_id in comment_task_ids & tasks.keys()}
+    if comments:
+        rows = Comment.query.filter(
+            and_(
+                Comment.owner_id == current_owner_id(),
+                Comment.task_id.in_(comments.keys())
+            )
+        ).order_by(Comment.task_id, Comment.created_at)
+        for comment in rows:
+            comments[comment.task_id].append(comment.to_dict())
+
+    stats = None
+    responses = []
+    for sub in sub_requests:
+        if sub['op'] == 'tasks':
+            responses.append({
+                'op': 'tasks',
+                'tasks': [tasks[i] for i in sub['ids'] if i in tasks],
+                'missing_ids': [i for i in sub['ids'] if i not in tasks],
+            })
+        elif sub['op'] == 'comments':
+            responses.append({
+                'op': 'comments',
+                'comments': {str(i): comments[i] for i in sub['task_ids'] if i in comments},
+                'missing_ids': [i for i in sub['task_ids'] if i not in comments],
+            })
+        else:
+            if stats is None:
+                stats = summary_stats()
+            responses.append({'op': 'stats', 'stats': stats})
+
+    return jsonify({'responses': responses})
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create missing tables and upgrade existing ones in place."""
+    db.create_all()
+    upgrade_schema()
+    click.echo('Initialized the database.')
+
+
+def upgrade_schema():
+    """Add columns and indexes that create_all() skips on existing tables.
+
+    New columns must be nullable or have a scalar default so that existing
+    rows can be backfilled by ``ALTER TABLE ... ADD COLUMN``.
+    """
+    inspector = db.inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                ddl = f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(conn.dialect)}'
+                if not column.nullable:
+                    if column.default is None or not column.default.is_scalar:
+                        raise click.ClickException(f'Cannot add NOT NULL column {table.name}.{column.name} '
+                                                   'without a scalar default')
+                    ddl += f' NOT NULL DEFAULT {column.default.arg!r}'
+                conn.execute(db.text(ddl))
+
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+@click.command('reminders')
+@click.option('--once', is_flag=True, help='Run a single tick and exit.')
+@with_appcontext
+def reminders_command(once):
+    """Run the due-date reminder scheduler in the foreground."""
+    from reminders import LogSink
+
+    scheduler = build_reminder_scheduler(current_app._get_current_object(), [LogSink()])
+    if once:
+        click.echo(f'Emitted {scheduler.tick()} reminder(s).')
+    else:
+        scheduler.run()
+
+
+def build_reminder_scheduler(app, sinks):
+    from reminders import ReminderScheduler, WebhookSink
+
+    if app.config['REMINDER_WEBHOOK_URL']:
+        sinks = [*sinks, WebhookSink(app.config['REMINDER_WEBHOOK_URL'])]
+    return ReminderScheduler(
+        app,
+        sinks,
+        lead=timedelta(minutes=app.config['REMINDER_LEAD_MINUTES']),
+        interval=app.config['REMINDER_INTERVAL_SECONDS'],
+    )
+
+
+def create_app(config=None):
+    """Application factory.
+
+    Settings are layered: DEFAULT_CONFIG, then ``FLASK_*`` environment
+    variables, then ``config``. Creating the app doesn't touch the database;
+    run ``flask --app app init-db`` to create the schema.
+    """
+    app = Flask(__name__)
+    app.config.from_mapping(DEFAULT_CONFIG)
+    app.config.from_prefixed_env()
+    if config:
+        app.config.from_mapping(config)
+    ratelimit.init_app(app)
+
+    db.init_app(app)
+    app.register_blueprint(bp)
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(reminders_command)
+    return app
+
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,91 @@
+"""Benchmark cold start: app import/factory time and gunicorn worker boot.
+
+Usage: python benchmarks/bench_startup.py [--runs 10] [--no-gunicorn]
+
+Import time is measured in a fresh interpreter per run. Worker boot is the
+time from launching gunicorn until the first request is answered, with and
+without preload_app.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "from app import create_app; create_app(); "
+    "print(time.perf_counter() - t)"
+)
+
+
+def median(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2]
+
+
+def bench_import(runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip()))
+    print(f"import + create_app       median {median(samples) * 1000:.1f} ms")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def boot_once(preload, db_uri):
+    port = free_port()
+    env = dict(os.environ, GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_WORKERS="1",
+               GUNICORN_PRELOAD="1" if preload else "0", FLASK_SQLALCHEMY_DATABASE_URI=db_uri)
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/api/stats/summary", timeout=1)
+                return time.perf_counter() - start
+            except OSError:
+                if proc.poll() is not None:
+                    raise RuntimeError("gunicorn exited during startup")
+                time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def bench_gunicorn(runs):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        subprocess.run([sys.executable, "-m", "flask", "--app", "app", "init-db"], cwd=ROOT, check=True,
+                       env=dict(os.environ, FLASK_SQLALCHEMY_DATABASE_URI=db_uri), capture_output=True)
+        for preload in (False, True):
+            samples = [boot_once(preload, db_uri) for _ in range(runs)]
+            label = "gunicorn boot (preload)" if preload else "gunicorn boot"
+            print(f"{label:<25} median {median(samples) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--no-gunicorn", action="store_true")
+    args = parser.parse_args()
+
+    bench_import(args.runs)
+    if not args.no_gunicorn:
+        bench_gunicorn(args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark per-owner query latency as the tasks table grows.
+
+Usage: python benchmarks/bench_tenant_scaling.py [--sizes 10000 100000 1000000] [--rows-per-owner 100]
+
+Each size is loaded into a fresh SQLite file with a fixed number of rows per
+owner, so the owner count grows with the table. The per-owner queries should
+take roughly the same time at every size since they only scan one owner's
+slice of the composite indexes.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, select
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import db, Task  # noqa: E402
+
+
+def load(engine, size, owners):
+    now = datetime.utcnow()
+    rows = []
+    for i in range(size):
+        completed = random.random() < 0.5
+        rows.append({
+            'owner_id': i % owners,
+            'title': f'Task {i}',
+            'status': 'Completed' if completed else 'Pending',
+            'due_date': now + timedelta(days=random.randint(-30, 30)),
+            'priority': random.choice(['Low', 'Medium', 'High']),
+            'tags': None,
+            'created_at': now - timedelta(minutes=i),
+            'completed_at': now - timedelta(days=random.randint(0, 30)) if completed else None,
+        })
+        if len(rows) == 50000:
+            with engine.begin() as conn:
+                conn.execute(Task.__table__.insert(), rows)
+            rows = []
+    if rows:
+        with engine.begin() as conn:
+            conn.execute(Task.__table__.insert(), rows)
+
+
+def queries(owner_id):
+    now = datetime.utcnow()
+    return {
+        'index': select(Task.id).where(Task.owner_id == owner_id).order_by(Task.created_at.desc()),
+        'overdue': select(func.count(Task.id)).where(
+            Task.owner_id == owner_id, Task.status == 'Pending', Task.due_date < now),
+        'completed-week': select(func.count(Task.id)).where(
+            Task.owner_id == owner_id, Task.status == 'Completed',
+            Task.completed_at >= now - timedelta(days=7)),
+        'by-priority': select(Task.priority, func.count(Task.id)).where(
+            Task.owner_id == owner_id, Task.status == 'Pending').group_by(Task.priority),
+    }
+
+
+def run(size, rows_per_owner, iterations):
+    owners = max(1, size // rows_per_owner)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        db.metadata.create_all(engine)
+        load(engine, size, owners)
+
+        timings = {}
+        with engine.connect() as conn:
+            for _ in range(iterations):
+                for name, stmt in queries(random.randrange(owners)).items():
+                    start = time.perf_counter()
+                    conn.execute(stmt).all()
+                    timings.setdefault(name, []).append(time.perf_counter() - start)
+        engine.dispose()
+
+    for name, samples in timings.items():
+        samples.sort()
+        median = samples[len(samples) // 2] * 1000
+        print(f"{size:>10} rows  {name:<16} median {median:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--rows-per-owner', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.rows_per_owner, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Group commit: batch concurrent inserts into a single transaction.
+
+SQLite has one writer and every commit fsyncs, so bursts of small inserts
+serialize on the disk. ``GroupCommitter`` collects inserts submitted within
+a short window and commits them together on a background thread.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitter:
+    def __init__(self, app, db, window=0.005, max_batch=500, timeout=30):
+        self.app = app
+        self.db = db
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+        self._thread.start()
+
+    def submit(self, obj):
+        """Queue a new model instance and block until it is committed.
+
+        Returns ``obj.to_dict()`` as flushed; re-raises any error from
+        inserting this particular row. Raises TimeoutError if the writer
+        hasn't answered within ``timeout`` seconds, in which case the row
+        may still be committed later.
+        """
+        future = Future()
+        self._queue.put((obj, future))
+        return future.result(timeout=self.timeout)
+
+    def _collect(self):
+        # The window is fixed from the first row, so a steady trickle of
+        # inserts can't keep the batch (and its first caller) waiting.
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        try:
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                batch.append(self._queue.get(timeout=remaining))
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                with self.app.app_context():
+                    try:
+                        self._commit(batch)
+                    finally:
+                        self.db.session.remove()
+            except Exception as e:
+                # Keep the writer alive and never leave a submitter waiting
+                logger.exception("Group commit batch failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _commit(self, batch):
+        # Results are built from the flushed state, before commit expires
+        # the rows, so the writer doesn't re-SELECT every row it inserted.
+        session = self.db.session
+        try:
+            session.add_all([obj for obj, _ in batch])
+            session.flush()
+            results = [obj.to_dict() for obj, _ in batch]
+            session.commit()
+        except Exception:
+            session.rollback()
+            # Fall back to one transaction per row so one bad insert
+            # doesn't fail the rest of the batch.
+            for obj, future in batch:
+                self._commit_one(obj, future)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _commit_one(self, obj, future):
+        session = self.db.session
+        try:
+            session.add(obj)
+            session.flush()
+            result = obj.to_dict()
+            session.commit()
+            future.set_result(result)
+        except Exception as e:
+            session.rollback()
+            future.set_exception(e)
@@ -0,0 +1,30 @@
+"""Gunicorn settings.
+
+With GUNICORN_PRELOAD=1 the app is built once in the master and forked
+into workers (preload_app). That only pays off with many workers; with one
+or two it boots slower, so it is off by default.
+
+Group commit only batches inserts that are in flight at the same time in
+one process, so when FLASK_GROUP_COMMIT_ENABLED is set each worker runs
+GUNICORN_THREADS (default 8) request threads instead of one.
+"""
+import os
+
+wsgi_app = "app:create_app()"
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "0") == "1"
+
+_group_commit = os.environ.get("FLASK_GROUP_COMMIT_ENABLED", "").lower() in ("1", "true")
+threads = int(os.environ.get("GUNICORN_THREADS", "8" if _group_commit else "1"))
+if threads > 1:
+    worker_class = "gthread"
+
+
+def post_fork(server, worker):
+    # Connections opened in the master must not be shared across forks
+    if preload_app:
+        from app import db
+
+        with server.app.wsgi().app_context():
+            db.engine.dispose(close=False)
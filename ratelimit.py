@@ -0,0 +1,106 @@
+"""Token-bucket rate limiting for mutation endpoints.
+
+Buckets live in a store so several workers can share them. ``MemoryStore``
+keeps them in-process; a shared store (Redis, memcached, a database table)
+only needs to implement ``BucketStore.take``.
+"""
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+
+class BucketStore:
+    """Interface for token-bucket storage."""
+
+    def take(self, key, rate, capacity):
+        """Try to take one token from the bucket at ``key``.
+
+        ``rate`` is tokens refilled per second and ``capacity`` the burst size.
+        Returns ``(allowed, retry_after_seconds)``.
+        """
+        raise NotImplementedError
+
+
+class MemoryStore(BucketStore):
+    """In-process bucket store; limits are per worker.
+
+    A bucket that has refilled completely is the same as a missing one, so
+    full buckets are dropped every ``sweep_interval`` seconds.
+    """
+
+    def __init__(self, clock=time.monotonic, sweep_interval=60):
+        self._clock = clock
+        self._sweep_interval = sweep_interval
+        self._next_sweep = clock() + sweep_interval
+        self._buckets = {}  # key -> (tokens, last_refill, full_at)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def take(self, key, rate, capacity):
+        with self._lock:
+            now = self._clock()
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+            tokens, last, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+            return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def _sweep(self, now):
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+        self._next_sweep = now + self._sweep_interval
+
+
+def validate_config(config):
+    """Raise ValueError for rate-limit settings that can't work."""
+    if not config.get('RATE_LIMIT_ENABLED'):
+        return
+    if not config['RATE_LIMIT_PER_SECOND'] > 0:
+        raise ValueError('RATE_LIMIT_PER_SECOND must be greater than 0')
+    if not config['RATE_LIMIT_BURST'] >= 1:
+        raise ValueError('RATE_LIMIT_BURST must be at least 1')
+
+
+def init_app(app):
+    """Validate settings and create the app's bucket store once."""
+    validate_config(app.config)
+    app.extensions['rate_limit_store'] = app.config.get('RATE_LIMIT_STORE') or MemoryStore()
+
+
+def client_key():
+    """Identify the caller by something it can't choose freely.
+
+    That is the proxy-set owner header when TRUST_OWNER_HEADER is on (the
+    remote address is then the proxy's), otherwise the remote address.
+    """
+    config = current_app.config
+    if config.get('TRUST_OWNER_HEADER'):
+        owner = request.headers.get(config['OWNER_HEADER'], '').strip()
+        if owner:
+            return f"owner:{owner}"
+    return f"addr:{request.remote_addr or 'unknown'}"
+
+
+def rate_limited(view):
+    """Limit a view per client and endpoint when ``RATE_LIMIT_ENABLED`` is set."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        config = current_app.config
+        if config.get('RATE_LIMIT_ENABLED'):
+            store = current_app.extensions['rate_limit_store']
+            key = f"{client_key()}:{request.endpoint}"
+            allowed, retry_after = store.take(key, config['RATE_LIMIT_PER_SECOND'], config['RATE_LIMIT_BURST'])
+            if not allowed:
+                response = jsonify({'error': 'Rate limit exceeded'})
+                response.headers['Retry-After'] = str(max(1, round(retry_after)))
+                return response, 429
+        return view(*args, **kwargs)
+    return wrapper
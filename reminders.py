@@ -0,0 +1,133 @@
+"""Due-date reminders.
+
+Two kinds of reminder are emitted: ``upcoming`` when a task enters the
+configured lead time (only if the lead time is non-zero) and ``overdue``
+when its due time passes. Each kind has a per-task ``*_reminded_at`` column,
+which the Task model clears whenever ``due_date`` or ``status`` changes.
+
+``ReminderScheduler`` seeks the ``(status, <kind>_reminded_at, due_date)``
+index for pending, not-yet-reminded tasks that are due, so each tick reads
+only rows still owed a reminder, whatever their due date. Rows are claimed
+with a conditional UPDATE before events are emitted, so two schedulers
+racing on the same database never notify the same task twice; a crash
+between claiming and emitting drops that batch instead.
+"""
+import json
+import logging
+import threading
+import urllib.request
+from datetime import timedelta
+
+from sqlalchemy import and_, update
+
+from app import db, Task, now_utc
+
+logger = logging.getLogger(__name__)
+
+
+# Sinks: any callable taking the event dict
+
+class LogSink:
+    def __init__(self, logger=logger):
+        self.logger = logger
+
+    def __call__(self, event):
+        task = event['task']
+        self.logger.info("Reminder (%s): task #%s %r due %s", event['kind'], task['id'], task['title'],
+                         task['due_date'])
+
+
+class WebhookSink:
+    """POST each event as JSON to a URL. Failures are logged, not retried."""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, event):
+        data = json.dumps(event).encode()
+        req = urllib.request.Request(self.url, data=data, headers={'Content-Type': 'application/json'})
+        try:
+            urllib.request.urlopen(req, timeout=self.timeout).close()
+        except OSError as e:
+            logger.warning("Reminder webhook to %s failed: %s", self.url, e)
+
+
+class ReminderScheduler:
+    def __init__(self, app, sinks, lead=timedelta(0), interval=60, batch_size=500):
+        self.app = app
+        self.sinks = list(sinks)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.lead = lead
+        self._stop = threading.Event()
+
+    def tick(self):
+        """Emit reminders for tasks that are due and not yet reminded. Returns the count."""
+        now = now_utc()
+        emitted = 0
+        if self.lead:
+            # Tasks already overdue only get the overdue reminder
+            emitted += self._scan('upcoming', Task.upcoming_reminded_at, now + self.lead, after=now)
+        emitted += self._scan('overdue', Task.overdue_reminded_at, now)
+        return emitted
+
+    def _scan(self, kind, reminded_at, horizon, after=None):
+        emitted = 0
+        while True:
+            query = Task.query.filter(
+                and_(
+                    Task.status == "Pending",
+                    reminded_at.is_(None),
+                    Task.due_date <= horizon
+                )
+            )
+            if after is not None:
+                query = query.filter(Task.due_date > after)
+            tasks = query.order_by(Task.due_date, Task.id).limit(self.batch_size).all()
+            if not tasks:
+                db.session.commit()
+                return emitted
+
+            events = {task.id: {'kind': kind, 'task': task.to_dict()} for task in tasks}
+            claimed = set(db.session.execute(
+                update(Task)
+                .where(and_(Task.id.in_(events.keys()), reminded_at.is_(None)))
+                .values({reminded_at: now_utc()})
+                .returning(Task.id),
+                execution_options={'synchronize_session': False},
+            ).scalars())
+            db.session.commit()
+
+            # Rows claimed by another scheduler in the meantime are skipped
+            for task_id, event in events.items():
+                if task_id in claimed:
+                    self._emit(event)
+            emitted += len(claimed)
+            if len(tasks) < self.batch_size:
+                return emitted
+
+    def _emit(self, event):
+        event['emitted_at'] = now_utc().isoformat()
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception:
+                logger.exception("Reminder sink %r failed", sink)
+
+    def run(self):
+        """Tick every ``interval`` seconds until stop() is called."""
+        while not self._stop.is_set():
+            with self.app.app_context():
+                try:
+                    self.tick()
+                except Exception:
+                    logger.exception("Reminder tick failed")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        """Make run() return after the current tick."""
+        self._stop.set()
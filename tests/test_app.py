@@ -1,14 +1,26 @@
 """Test suite for ToDo app - CRUD Operations."""
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
 import pytest
-from app import app, db, Task
+from sqlalchemy import event
+from app import create_app, db, Task, Comment
+from group_commit import GroupCommitter
+from ratelimit import MemoryStore
+from reminders import ReminderScheduler
+
+app = create_app({
+    'TESTING': True,
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+    'TRUST_OWNER_HEADER': True,
+})
 
 
 @pytest.fixture
 def client():
     """Create a test client for the Flask app with in-memory database."""
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-
     with app.app_context():
         db.create_all()
         yield app.test_client()
@@ -261,3 +273,566 @@ def test_delete_nonexistent_task_fails_gracefully(client):
     # ASSERT - Should show error/warning message
     assert response.status_code == 200
     assert b"not found" in response.data or b"warning" in response.data
+
+
+# ============================================================================
+# Multi-tenant Tests
+# ============================================================================
+
+def test_tasks_are_scoped_to_owner(client):
+    """Test that owners only see their own tasks in the list."""
+    # ARRANGE
+    client.post("/add", data={"title": "Alice task"}, headers={"X-Owner-Id": "1"}, follow_redirects=True)
+    client.post("/add", data={"title": "Bob task"}, headers={"X-Owner-Id": "2"}, follow_redirects=True)
+
+    # ACT
+    alice_view = client.get("/", headers={"X-Owner-Id": "1"})
+    bob_view = client.get("/", headers={"X-Owner-Id": "2"})
+
+    # ASSERT
+    assert b"Alice task" in alice_view.data
+    assert b"Bob task" not in alice_view.data
+    assert b"Bob task" in bob_view.data
+    assert b"Alice task" not in bob_view.data
+
+
+def test_owner_header_ignored_unless_trusted(client, monkeypatch):
+    """Test that X-Owner-Id has no effect unless TRUST_OWNER_HEADER is set."""
+    # ARRANGE
+    monkeypatch.setitem(app.config, 'TRUST_OWNER_HEADER', False)
+    client.post("/add", data={"title": "Owner zero task"}, follow_redirects=True)
+
+    # ACT
+    response = client.get("/", headers={"X-Owner-Id": "5"})
+
+    # ASSERT - still owner 0's view
+    assert b"Owner zero task" in response.data
+
+
+def test_invalid_owner_header_is_rejected(client):
+    """Test that a malformed trusted owner header doesn't fall back to owner 0."""
+    response = client.get("/api/stats/summary", headers={"X-Owner-Id": "abc"})
+    assert response.status_code == 400
+
+
+def test_stats_are_scoped_to_owner(client):
+    """Test that stats endpoints only count the current owner's tasks."""
+    # ARRANGE
+    for title in ("One", "Two"):
+        client.post("/add", data={"title": title}, headers={"X-Owner-Id": "1"})
+    client.post("/add", data={"title": "Other"}, headers={"X-Owner-Id": "2"})
+
+    # ACT
+    summary = client.get("/api/stats/summary", headers={"X-Owner-Id": "1"}).get_json()
+    by_priority = client.get("/api/stats/by-priority", headers={"X-Owner-Id": "2"}).get_json()
+
+    # ASSERT
+    assert summary['total_pending'] == 2
+    assert by_priority == {"Medium": 1}
+
+
+def test_other_owners_tasks_are_not_found(client):
+    """Test that another owner's task can't be mutated or commented on."""
+    # ARRANGE
+    client.post("/add", data={"title": "Private"}, headers={"X-Owner-Id": "1"})
+    with app.app_context():
+        task_id = Task.query.filter_by(title="Private").first().id
+    other = {"X-Owner-Id": "2"}
+
+    # ACT
+    comments = client.get(f"/api/comments/{task_id}", headers=other)
+    created = client.post("/api/comments", json={"task_id": task_id, "body": "hi"}, headers=other)
+    bulk = client.post("/api/bulk-update", json={"task_ids": [task_id], "action": "delete"}, headers=other)
+
+    # ASSERT
+    assert comments.status_code == 404
+    assert created.status_code == 404
+    assert bulk.status_code == 404
+    with app.app_context():
+        assert Task.query.get(task_id) is not None
+
+
+def test_comments_inherit_task_owner(client):
+    """Test that new comments are stamped with the task's owner and the requester as author."""
+    # ARRANGE
+    owner = {"X-Owner-Id": "7"}
+    client.post("/add", data={"title": "Discuss"}, headers=owner)
+    with app.app_context():
+        task_id = Task.query.filter_by(title="Discuss").first().id
+
+    # ACT - a client-supplied author_id is ignored
+    response = client.post("/api/comments", json={"task_id": task_id, "body": "note", "author_id": 99},
+                           headers=owner)
+
+    # ASSERT
+    assert response.status_code == 201
+    assert response.get_json()['owner_id'] == 7
+    assert response.get_json()['author_id'] == 7
+
+
+def test_owner_queries_use_composite_index(client):
+    """Test that per-owner stats queries are served by an owner-leading index."""
+    with app.app_context():
+        plan = db.session.execute(db.text(
+            "EXPLAIN QUERY PLAN SELECT count(*) FROM tasks "
+            "WHERE owner_id = 1 AND status = 'Pending' AND due_date < '2030-01-01'"
+        )).all()
+    assert any('ix_tasks_owner_status_due' in row[-1] for row in plan)
+
+
+# ============================================================================
+# Write Coalescing and Rate Limiting Tests
+# ============================================================================
+
+def test_group_commit_batches_concurrent_comments(tmp_path):
+    """Test that concurrent comment inserts share commits through the group committer."""
+    # ARRANGE - file-backed so request threads and the writer use separate connections
+    gc_app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'todos.db'}",
+        'GROUP_COMMIT_ENABLED': True,
+        'GROUP_COMMIT_WINDOW_MS': 50,
+    })
+    with gc_app.app_context():
+        db.create_all()
+        task = Task(title="Busy task")
+        db.session.add(task)
+        db.session.commit()
+        task_id = task.id
+        engine = db.engine
+    commits = []
+    statuses = []
+    start = threading.Barrier(20)
+
+    def count_commit(conn):
+        commits.append(conn)
+
+    def post_comment(i):
+        client = gc_app.test_client()
+        start.wait()
+        rv = client.post("/api/comments", json={"task_id": task_id, "body": f"comment {i}"})
+        statuses.append((rv.status_code, rv.get_json()['id']))
+
+    # ACT
+    event.listen(engine, "commit", count_commit)
+    try:
+        threads = [threading.Thread(target=post_comment, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        event.remove(engine, "commit", count_commit)
+
+    # ASSERT
+    assert [status for status, _ in statuses] == [201] * 20
+    assert len({comment_id for _, comment_id in statuses}) == 20
+    assert len(commits) < 20
+    with gc_app.app_context():
+        assert Comment.query.filter_by(task_id=task_id).count() == 20
+        db.engine.dispose()
+
+
+def test_group_commit_window_is_fixed_from_first_row():
+    """Test that rows arriving inside the window don't extend it."""
+    # ARRANGE - a committer whose writer thread isn't consuming the queue
+    committer = GroupCommitter.__new__(GroupCommitter)
+    committer.window = 0.05
+    committer.max_batch = 500
+    committer._queue = queue.Queue()
+    committer._queue.put("first")
+
+    def trickle():
+        for i in range(20):
+            committer._queue.put(i)
+            time.sleep(0.01)
+
+    feeder = threading.Thread(target=trickle)
+    feeder.start()
+
+    # ACT
+    start = time.monotonic()
+    batch = committer._collect()
+    elapsed = time.monotonic() - start
+    feeder.join()
+
+    # ASSERT - closed at the deadline, not after the whole trickle
+    assert elapsed < 0.15
+    assert len(batch) < 21
+
+
+def test_group_commit_survives_failing_batch(client, monkeypatch):
+    """Test that an error while building results fails the submitter and keeps the writer alive."""
+    # ARRANGE
+    committer = GroupCommitter(app, db, timeout=5)
+
+    def broken_to_dict(self):
+        raise RuntimeError("boom")
+
+    # ACT / ASSERT - the failing insert raises instead of hanging
+    monkeypatch.setattr(Task, 'to_dict', broken_to_dict)
+    with pytest.raises(RuntimeError):
+        committer.submit(Task(title="Broken"))
+    monkeypatch.undo()
+
+    # ASSERT - the writer thread still serves later inserts
+    assert committer.submit(Task(title="Works"))['title'] == "Works"
+
+
+def test_memory_store_refills_tokens():
+    """Test that the token bucket allows a burst, then refills over time."""
+    # ARRANGE
+    now = [0.0]
+    store = MemoryStore(clock=lambda: now[0])
+
+    # ACT / ASSERT
+    assert store.take("k", rate=1, capacity=2) == (True, 0.0)
+    assert store.take("k", rate=1, capacity=2) == (True, 0.0)
+    allowed, retry_after = store.take("k", rate=1, capacity=2)
+    assert not allowed and retry_after == pytest.approx(1.0)
+
+    now[0] = 1.0
+    assert store.take("k", rate=1, capacity=2)[0]
+
+
+def test_memory_store_evicts_full_buckets():
+    """Test that buckets which have refilled are dropped by the periodic sweep."""
+    # ARRANGE
+    now = [0.0]
+    store = MemoryStore(clock=lambda: now[0], sweep_interval=10)
+    for i in range(100):
+        store.take(f"client-{i}", rate=1, capacity=5)
+
+    # ACT - long enough for every bucket to refill
+    now[0] = 10.0
+    store.take("client-0", rate=1, capacity=5)
+
+    # ASSERT
+    assert len(store) == 1
+
+
+def test_rate_limit_ignores_untrusted_owner_header(client, monkeypatch):
+    """Test that rotating X-Owner-Id doesn't buy fresh buckets when the header isn't trusted."""
+    # ARRANGE
+    monkeypatch.setitem(app.config, 'TRUST_OWNER_HEADER', False)
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_BURST', 2)
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_PER_SECOND', 0.01)
+    monkeypatch.setitem(app.extensions, 'rate_limit_store', MemoryStore())
+
+    # ACT
+    statuses = [client.post("/add", data={"title": "spam"}, headers={"X-Owner-Id": str(i)}).status_code
+                for i in range(3)]
+
+    # ASSERT
+    assert statuses == [302, 302, 429]
+
+
+def test_rate_limit_config_is_validated():
+    """Test that a zero refill rate is rejected when the app is built."""
+    with pytest.raises(ValueError):
+        create_app({'RATE_LIMIT_ENABLED': True, 'RATE_LIMIT_PER_SECOND': 0})
+
+
+def test_rate_limit_rejects_noisy_client(client, monkeypatch):
+    """Test that one client exceeding its burst gets 429 without affecting others."""
+    # ARRANGE
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_BURST', 3)
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_PER_SECOND', 0.01)
+    monkeypatch.setitem(app.extensions, 'rate_limit_store', MemoryStore())
+
+    # ACT
+    noisy = [client.post("/add", data={"title": "spam"}, headers={"X-Owner-Id": "1"}).status_code
+             for _ in range(4)]
+    quiet = client.post("/add", data={"title": "hello"}, headers={"X-Owner-Id": "2"})
+
+    # ASSERT
+    assert noisy == [302, 302, 302, 429]
+    assert quiet.status_code == 302
+
+
+# ============================================================================
+# App Factory Tests
+# ============================================================================
+
+def test_create_app_does_not_touch_schema(tmp_path):
+    """Test that building an app leaves the database untouched until init-db runs."""
+    # ARRANGE
+    db_path = tmp_path / "todos.db"
+    fresh_app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{db_path}"})
+
+    # ASSERT - factory alone creates nothing
+    assert not db_path.exists()
+
+    # ACT - explicit schema step
+    result = fresh_app.test_cli_runner().invoke(args=["init-db"])
+
+    # ASSERT
+    assert result.exit_code == 0
+    with fresh_app.app_context():
+        assert {'tasks', 'comments'} <= set(db.inspect(db.engine).get_table_names())
+        db.engine.dispose()
+
+
+def test_create_app_applies_config_overrides():
+    """Test that config passed to the factory overrides the defaults."""
+    custom = create_app({'RATE_LIMIT_BURST': 99})
+    assert custom.config['RATE_LIMIT_BURST'] == 99
+    assert custom.config['GROUP_COMMIT_ENABLED'] is False
+
+
+# ============================================================================
+# Reminder Tests
+# ============================================================================
+
+def add_due_task(title, due_in, owner_id=0, status="Pending"):
+    task = Task(title=title, owner_id=owner_id, status=status, due_date=datetime.utcnow() + due_in)
+    db.session.add(task)
+    db.session.commit()
+    return task.id
+
+
+def test_reminders_emit_once_per_task(client):
+    """Test that each overdue task is reminded exactly once across ticks."""
+    # ARRANGE
+    events = []
+    scheduler = ReminderScheduler(app, [events.append])
+    overdue_id = add_due_task("Late", timedelta(hours=-1))
+    add_due_task("Done", timedelta(hours=-1), status="Completed")
+    add_due_task("Later", timedelta(days=1))
+
+    # ACT
+    first = scheduler.tick()
+    second = scheduler.tick()
+
+    # ASSERT
+    assert (first, second) == (1, 0)
+    assert [(e['kind'], e['task']['id']) for e in events] == [('overdue', overdue_id)]
+
+
+def test_reminders_only_emit_newly_due_tasks(client):
+    """Test that a later tick picks up only tasks not yet reminded."""
+    # ARRANGE
+    events = []
+    scheduler = ReminderScheduler(app, [events.append], batch_size=2)
+    for i in range(5):
+        add_due_task(f"Old {i}", timedelta(hours=-2))
+    scheduler.tick()
+    events.clear()
+
+    # ACT
+    new_id = add_due_task("New", timedelta(minutes=-1))
+    count = scheduler.tick()
+
+    # ASSERT
+    assert count == 1
+    assert [e['task']['id'] for e in events] == [new_id]
+
+
+def test_reminders_lead_time_emits_upcoming(client):
+    """Test that tasks inside the lead time get an 'upcoming' reminder first."""
+    # ARRANGE
+    events = []
+    scheduler = ReminderScheduler(app, [events.append], lead=timedelta(hours=2))
+    soon_id = add_due_task("Soon", timedelta(hours=1))
+
+    # ACT
+    scheduler.tick()
+
+    # ASSERT
+    assert [(e['kind'], e['task']['id']) for e in events] == [('upcoming', soon_id)]
+
+
+def test_reminders_catch_tasks_due_earlier_than_last_reminded(client):
+    """Test that a task inserted with an older due time than already-reminded ones is still reminded."""
+    # ARRANGE
+    events = []
+    scheduler = ReminderScheduler(app, [events.append])
+    add_due_task("Recent", timedelta(minutes=-1))
+    scheduler.tick()
+    events.clear()
+
+    # ACT
+    backdated_id = add_due_task("Backdated", timedelta(hours=-3))
+    count = scheduler.tick()
+
+    # ASSERT
+    assert count == 1
+    assert [e['task']['id'] for e in events] == [backdated_id]
+
+
+def test_reminders_rearm_when_task_reopened(client):
+    """Test that a past-due task toggled Completed -> Pending is reminded again."""
+    # ARRANGE
+    events = []
+    scheduler = ReminderScheduler(app, [events.append])
+    task_id = add_due_task("Reopen", timedelta(hours=-1))
+    scheduler.tick()
+    client.get(f"/toggle/{task_id}")
+    assert scheduler.tick() == 0
+
+    # ACT
+    client.get(f"/toggle/{task_id}")
+    count = scheduler.tick()
+
+    # ASSERT
+    assert count == 1
+    assert [e['task']['id'] for e in events] == [task_id, task_id]
+
+
+def test_rearm_overwrites_reminder_claimed_after_load(client):
+    """Test that editing a due date clears a reminder the scheduler claimed after the task was loaded."""
+    # ARRANGE - load the task while it is still unreminded
+    task_id = add_due_task("Race", timedelta(hours=-1))
+    db.session.expire_all()
+    task = db.session.get(Task, task_id)
+    assert task.overdue_reminded_at is None
+
+    # ACT - the scheduler claims the row, then the edit commits
+    db.session.execute(db.text("UPDATE tasks SET overdue_reminded_at = '2024-01-01 00:00:00' WHERE id = :id"),
+                       {'id': task_id})
+    task.due_date = datetime.utcnow() - timedelta(minutes=5)
+    db.session.commit()
+
+    # ASSERT
+    db.session.expire_all()
+    assert db.session.get(Task, task_id).overdue_reminded_at is None
+
+
+def test_reminder_scan_uses_unreminded_index(client):
+    """Test that the scheduler's scan is served by the (status, reminded_at, due_date) index."""
+    with app.app_context():
+        plan = db.session.execute(db.text(
+            "EXPLAIN QUERY PLAN SELECT id FROM tasks "
+            "WHERE status = 'Pending' AND overdue_reminded_at IS NULL AND due_date <= '2030-01-01' "
+            "ORDER BY due_date, id LIMIT 500"
+        )).all()
+    assert any('ix_tasks_status_overdue_due' in row[-1] for row in plan)
+
+
+# ============================================================================
+# Batch Read Tests
+# ============================================================================
+
+def test_get_task_by_id(client):
+    """Test fetching a single task as JSON, scoped to its owner."""
+    # ARRANGE
+    with app.app_context():
+        task_id = add_due_task("Fetch me", timedelta(days=1), owner_id=3)
+
+    # ACT
+    own = client.get(f"/api/tasks/{task_id}", headers={"X-Owner-Id": "3"})
+    other = client.get(f"/api/tasks/{task_id}", headers={"X-Owner-Id": "4"})
+
+    # ASSERT
+    assert own.status_code == 200
+    assert own.get_json()['title'] == "Fetch me"
+    assert other.status_code == 404
+
+
+def test_batch_combines_tasks_comments_and_stats(client):
+    """Test that one batch request returns every sub-response in order."""
+    # ARRANGE
+    with app.app_context():
+        first = add_due_task("First", timedelta(days=1))
+        second = add_due_task("Second", timedelta(days=1))
+        foreign = add_due_task("Foreign", timedelta(days=1), owner_id=9)
+    client.post("/api/comments", json={"task_id": first, "body": "a"})
+    client.post("/api/comments", json={"task_id": first, "body": "b"})
+    payload = {"requests": [
+        {"op": "tasks", "ids": [second, first, foreign]},
+        {"op": "comments", "task_ids": [first, second, 999]},
+        {"op": "stats"},
+    ]}
+
+    # ACT
+    response = client.post("/api/batch", json=payload)
+
+    # ASSERT
+    assert response.status_code == 200
+    tasks, comments, stats = response.get_json()['responses']
+    assert [t['title'] for t in tasks['tasks']] == ["Second", "First"]
+    assert tasks['missing_ids'] == [foreign]
+    assert [c['body'] for c in comments['comments'][str(first)]] == ["a", "b"]
+    assert comments['comments'][str(second)] == []
+    assert comments['missing_ids'] == [999]
+    assert stats['stats']['total_pending'] == 2
+
+
+def test_batch_uses_two_queries_for_tasks_and_comments(client):
+    """Test that tasks and comments for many ids are fetched with one query each."""
+    # ARRANGE
+    with app.app_context():
+        ids = [add_due_task(f"Task {i}", timedelta(days=1)) for i in range(20)]
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    payload = {"requests": [{"op": "tasks", "ids": ids}, {"op": "comments", "task_ids": ids}]}
+
+    # ACT
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            response = client.post("/api/batch", json=payload)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+
+    # ASSERT
+    assert response.status_code == 200
+    assert len(statements) == 2
+
+
+def test_batch_rejects_invalid_op(client):
+    """Test that unknown sub-request ops are rejected."""
+    response = client.post("/api/batch", json={"requests": [{"op": "delete", "ids": [1]}]})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("payload", [
+    [{"op": "stats"}],
+    {"requests": [{"op": "tasks", "ids": [True, 1]}]},
+    {"requests": [{"op": "tasks", "ids": [1] * 501}]},
+    {"requests": [{"op": ["tasks"], "ids": [1]}]},
+])
+def test_batch_rejects_malformed_payloads(client, payload):
+    """Test that non-object bodies, boolean ids, oversized id lists and non-string ops get a 400."""
+    response = client.post("/api/batch", json=payload)
+    assert response.status_code == 400
+
+
+def test_init_db_upgrades_existing_schema(tmp_path):
+    """Test that init-db adds new columns and indexes to a pre-tenant database."""
+    # ARRANGE - tables as created before owner_id existed
+    db_path = tmp_path / "todos.db"
+    old_app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{db_path}"})
+    with old_app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(db.text(
+                "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR(255) NOT NULL, "
+                "status VARCHAR(50) NOT NULL, due_date DATETIME, priority VARCHAR(50) NOT NULL, "
+                "tags VARCHAR(255), created_at DATETIME NOT NULL, completed_at DATETIME)"
+            ))
+            conn.execute(db.text(
+                "CREATE TABLE comments (id INTEGER PRIMARY KEY, task_id INTEGER NOT NULL REFERENCES tasks (id), "
+                "author_id INTEGER, body TEXT NOT NULL, created_at DATETIME NOT NULL)"
+            ))
+            conn.execute(db.text(
+                "INSERT INTO tasks (title, status, priority, created_at) "
+                "VALUES ('Legacy', 'Pending', 'Medium', '2024-01-01 00:00:00')"
+            ))
+
+    # ACT
+    result = old_app.test_cli_runner().invoke(args=["init-db"])
+
+    # ASSERT
+    assert result.exit_code == 0, result.output
+    response = old_app.test_client().get("/")
+    assert response.status_code == 200
+    assert b"Legacy" in response.data
+    with old_app.app_context():
+        inspector = db.inspect(db.engine)
+        assert 'owner_id' in {c['name'] for c in inspector.get_columns('comments')}
+        assert 'ix_tasks_owner_status_due' in {i['name'] for i in inspector.get_indexes('tasks')}
+        db.engine.dispose()